@@ -1,99 +1,772 @@
-import time
+import asyncio
+import atexit
+import collections
+import json
 import logging
-from web3 import Web3
-from web3.exceptions import TimeExhausted
-import requests
+import queue
+import random
+import signal
+import statistics
 import sys
-from typing import Optional
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, NamedTuple, Optional
+
+import aiohttp
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Response decoding: orjson parses straight from bytes and is several
+# times faster than the stdlib decoder on RPC payloads.
+_loads = json.loads if orjson is None else orjson.loads
+
+logger = logging.getLogger(__name__)
+
+# Pre-bound RNG: skips the module attribute lookup on every retry draw
+_rand = random.random
 
 # Configure provider URL (replace with your actual provider URL/key)
 PROVIDER_URL = "https://mainnet.base.org/v1/infura/YOUR_PROJECT_ID"
 
-# Initialize Web3 with a timeout
-web3 = Web3(Web3.HTTPProvider(PROVIDER_URL, request_kwargs={'timeout': 10}))
+# One monitor task is scheduled per URL, so a single process can watch
+# several chains/providers concurrently on the event loop.
+PROVIDER_URLS = [PROVIDER_URL]
+
+# url -> pool of equivalent endpoints for the same chain. Fetches try the
+# pool in order of EMA-tracked latency and fail over to the next endpoint
+# immediately instead of backing off against a dead one; a failed endpoint
+# sits out for ENDPOINT_COOLDOWN seconds. Caching, breakers and samples
+# stay keyed by the primary url.
+RPC_ENDPOINTS: dict[str, list[str]] = {PROVIDER_URL: [PROVIDER_URL]}
+
+ENDPOINT_EMA_ALPHA = 0.2
+ENDPOINT_COOLDOWN = 30.0
 
-def fetch_gas_prices(retries: int = 5, delay: int = 1) -> Optional[dict]:
+# Shorter per-attempt timeout used only when a pool has a fallback to
+# fail over to; a lone endpoint keeps the full RPC_TIMEOUT.
+FAILOVER_TIMEOUT = aiohttp.ClientTimeout(total=2)
+
+# Emit one JSON line per sample on stdout for pipeline consumers
+OUTPUT_JSON = False
+
+# Log destination; rotated so a long-running monitor cannot fill the disk
+LOG_FILE = "gas_price_monitor.log"
+
+# Request timeout for JSON-RPC calls
+RPC_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+# Static headers sent with every RPC request; keep-alive keeps the TCP+TLS
+# connection hot between polls so each cycle skips the handshake.
+RPC_HEADERS = {
+    "Connection": "keep-alive",
+    "User-Agent": "base-gas-price-monitor",
+}
+
+def _wei_to_gwei(wei: int) -> float:
+    """Convert wei to gwei as a float (no Decimal in the hot path)."""
+    return wei * 1e-9
+
+def _backoff_delay(attempt: int, base: float, cap: float, r: float) -> float:
+    """Full-jitter backoff delay: r * min(base * 2**attempt, cap), r in [0, 1).
+
+    The exponent is clamped so an unbounded attempt counter (e.g. a
+    reconnect loop riding out a long outage) saturates at the cap
+    instead of overflowing the float power.
+    """
+    return r * min(base * (2.0 ** min(attempt, 30)), cap)
+
+# When Numba is available, compile the pure-numeric helpers; pointless at
+# 10s polling, but it matters when this module is reused as a library by
+# high-rate gas oracles. The pure-Python definitions are the fallback.
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - optional speedup
+    pass
+else:
+    _wei_to_gwei = njit(cache=True)(_wei_to_gwei)
+    _backoff_delay = njit(cache=True)(_backoff_delay)
+
+# Upper bound on a single retry delay (seconds)
+MAX_RETRY_DELAY = 30.0
+
+# Adaptive polling: when the rolling stdev of recent gas prices (gwei)
+# stays below the low threshold the interval doubles, and a spike above
+# the high threshold halves it, clamped to these bounds.
+MIN_POLL_INTERVAL = 2.0
+MAX_POLL_INTERVAL = 120.0
+VOLATILITY_WINDOW = 20
+VOLATILITY_LOW = 0.05
+VOLATILITY_HIGH = 0.5
+
+# Upper bound on the backoff budget for one fetch_gas_prices call; tracked
+# on the monotonic clock so NTP/DST jumps cannot corrupt the accounting.
+MAX_TOTAL_BACKOFF = 120.0
+
+# In WebSocket mode, refresh eth_gasPrice every Nth pushed head; the base
+# fee comes straight out of each header, so most heads need no RPC at all.
+GAS_PRICE_REFRESH_HEADS = 5
+
+# A WebSocket connection that stays up at least this long counts as
+# healthy; the next drop restarts the reconnect backoff from scratch
+# instead of treating it as the latest in a streak of failures.
+WS_STABLE_SECONDS = 60.0
+
+# Learned per-error-class backoff: each exception class keeps its own
+# delay scale, grown on failure and decayed on success, so a provider
+# timeout backs off harder than an error that usually clears instantly.
+BACKOFF_ALPHA_FAILURE = 0.5
+BACKOFF_ALPHA_SUCCESS = 0.2
+BACKOFF_SCALE_MIN = 0.25
+BACKOFF_SCALE_MAX = 8.0
+
+# exception class -> current delay multiplier (persists across cycles)
+_backoff_scale: dict[type, float] = {}
+
+class CircuitBreaker:
+    """
+    Hystrix-style circuit breaker around one provider endpoint.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls are short-circuited (no retries, no backoff sleeps) for
+    `open_duration` seconds; the first call afterwards is the half-open
+    probe whose outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 3, open_duration: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.open_duration = open_duration
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    def is_open(self) -> bool:
+        """Return True while the open window is active (probe not yet due)."""
+        if self._opened_at is None:
+            return False
+        return time.monotonic() - self._opened_at < self.open_duration
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+
+class GasSample(NamedTuple):
+    """One gas-price observation; fee fields are in gwei.
+
+    A NamedTuple keeps per-cycle allocation to a plain tuple and gives
+    downstream aggregators positional fields, so collecting per-field
+    arrays (struct-of-arrays) stays trivial.
+    """
+
+    gas_price: Optional[float]
+    base_fee: Optional[float] = None
+    priority_fee: Optional[float] = None
+    block_number: Optional[int] = None
+
+# All RPC reads go out as one JSON-RPC 2.0 batch. A single eth_feeHistory
+# call now covers everything: the next base fee, the median observed
+# priority fee (50th percentile reward) and the latest block number, so
+# the separate eth_gasPrice call is gone and additional reads can be
+# appended here later without extra round-trips.
+RPC_BATCH = [
+    {"jsonrpc": "2.0", "id": 1, "method": "eth_feeHistory", "params": ["0x1", "latest", [50]]},
+]
+
+# The payload is constant, so serialize it once at import time; every
+# request then sends pre-built bytes instead of re-encoding the dicts.
+_RPC_BATCH_BODY = json.dumps(RPC_BATCH, separators=(",", ":")).encode()
+_RPC_BATCH_HEADERS = {"Content-Type": "application/json"}
+
+# Base produces a block roughly every 2s; cache entries live until just
+# past the next expected block boundary instead of a fixed TTL, so a poll
+# right after a block tick never sees pre-tick data while mid-block polls
+# get the longest possible cache life.
+BLOCK_TIME = 2.0
+CACHE_TTL_BUFFER = 0.2
+
+# (url, key) -> (monotonic expiry, value); invalidated when a newer
+# block is seen for that provider
+_cache: dict[tuple[str, str], tuple[float, Any]] = {}
+_cache_block: dict[str, int] = {}
+
+# url -> last constructed sample, reused while the block number is unchanged
+_last_sample: dict[str, GasSample] = {}
+
+# url -> circuit breaker guarding that provider
+_breakers: dict[str, CircuitBreaker] = {}
+
+# url -> in-flight revalidation task. Holding the task here both marks
+# the refresh as in flight and keeps a strong reference so the event
+# loop cannot garbage-collect it mid-request.
+_refreshing: dict[str, "asyncio.Task[dict]"] = {}
+
+# endpoint -> EMA of request latency (seconds); endpoint -> monotonic time
+# until which it is benched after a failure
+_endpoint_ema: dict[str, float] = {}
+_endpoint_down_until: dict[str, float] = {}
+
+# One ClientSession reused for the whole monitor lifetime (keep-alive)
+_session: Optional[aiohttp.ClientSession] = None
+
+def _dynamic_ttl() -> float:
+    """Seconds until just past the next expected block boundary."""
+    return BLOCK_TIME - (time.monotonic() % BLOCK_TIME) + CACHE_TTL_BUFFER
+
+def _cache_get(url: str, key: str) -> Optional[Any]:
+    """Return the cached value for (url, key), or None if missing or expired."""
+    entry = _cache.get((url, key))
+    if entry is None:
+        return None
+    expires, value = entry
+    if time.monotonic() >= expires:
+        return None
+    return value
+
+def _cache_put(url: str, key: str, value: Any) -> None:
+    _cache[(url, key)] = (time.monotonic() + _dynamic_ttl(), value)
+
+def _backoff_failure(exc_type: type) -> float:
+    """Grow the delay scale for exc_type and return the new value."""
+    scale = min(_backoff_scale.get(exc_type, 1.0) * (1 + BACKOFF_ALPHA_FAILURE), BACKOFF_SCALE_MAX)
+    _backoff_scale[exc_type] = scale
+    return scale
+
+def _backoff_success() -> None:
+    """Decay all learned delay scales after a successful fetch."""
+    for exc_type, scale in _backoff_scale.items():
+        _backoff_scale[exc_type] = max(scale / (1 + BACKOFF_ALPHA_SUCCESS), BACKOFF_SCALE_MIN)
+
+async def exponential_backoff(attempt: int, base: float = 1.0, deadline: Optional[float] = None) -> float:
+    """
+    Sleep with AWS-style full-jitter exponential backoff.
+
+    The delay is drawn uniformly from [0, min(base * 2**attempt, cap)],
+    which decorrelates retries across clients after a shared provider
+    outage instead of letting them all hammer back in the same window.
+
+    Args:
+        attempt (int): Zero-based retry attempt number.
+        base (float): Base delay in seconds before exponential growth.
+        deadline (float, optional): time.monotonic() value after which no
+            further sleeping is allowed; the delay is clipped to it.
+
+    Returns:
+        float: The delay actually slept, in seconds (0.0 once past the deadline).
+    """
+    cap = MAX_RETRY_DELAY
+    if deadline is not None:
+        cap = min(cap, deadline - time.monotonic())
+        if cap <= 0:
+            return 0.0
+    wait_time = _backoff_delay(attempt, base, cap, _rand())
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Backing off %.2fs (attempt %d)", wait_time, attempt)
+    await asyncio.sleep(wait_time)
+    return wait_time
+
+def _get_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session, creating it on first use."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            timeout=RPC_TIMEOUT,
+            headers=RPC_HEADERS,
+            # Small pool sized for this workload; cache DNS answers and
+            # keep idle connections around well past the polling interval
+            # so neither resolution nor the TLS handshake is repeated
+            # between polls.
+            connector=aiohttp.TCPConnector(limit=4, ttl_dns_cache=300, keepalive_timeout=75),
+        )
+    return _session
+
+async def _reset_session() -> None:
+    """Close the shared session so the next call reconnects from scratch."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+def _ranked_endpoints(url: str) -> list[str]:
+    """Endpoints in `url`'s pool ordered by latency EMA, fastest first.
+
+    Benched endpoints are skipped while their cooldown runs, unless the
+    whole pool is benched, in which case everything is eligible again.
+    """
+    now = time.monotonic()
+    pool = RPC_ENDPOINTS.get(url, [url])
+    healthy = [u for u in pool if _endpoint_down_until.get(u, 0.0) <= now]
+    return sorted(healthy or pool, key=lambda u: _endpoint_ema.get(u, 0.0))
+
+async def _fetch_and_cache(url: str) -> dict:
+    """Issue the batched RPC request for `url`'s pool and repopulate the cache.
+
+    Endpoints are tried fastest-first; a transport error benches the
+    endpoint and moves on to the next one, so a dead primary costs one
+    short timeout rather than a full retry/backoff cycle. Only when the
+    whole pool fails does the last error propagate to the caller.
+    """
+    session = _get_session()
+    endpoints = _ranked_endpoints(url)
+    timeout = FAILOVER_TIMEOUT if len(endpoints) > 1 else RPC_TIMEOUT
+    last_err: Optional[Exception] = None
+    replies = None
+    for endpoint in endpoints:
+        started = time.monotonic()
+        try:
+            async with session.post(
+                endpoint, data=_RPC_BATCH_BODY, headers=_RPC_BATCH_HEADERS, timeout=timeout
+            ) as resp:
+                resp.raise_for_status()
+                replies = _loads(await resp.read())
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            _endpoint_down_until[endpoint] = time.monotonic() + ENDPOINT_COOLDOWN
+            last_err = e
+            if endpoint is not endpoints[-1]:
+                logger.warning("Endpoint %s failed (%s); failing over", endpoint, e)
+            continue
+        elapsed = time.monotonic() - started
+        ema = _endpoint_ema.get(endpoint)
+        _endpoint_ema[endpoint] = (
+            elapsed if ema is None else (1 - ENDPOINT_EMA_ALPHA) * ema + ENDPOINT_EMA_ALPHA * elapsed
+        )
+        break
+    if last_err is not None and replies is None:
+        raise last_err
+    # Servers may return batch replies in any order; match them by id.
+    by_id = {reply.get("id"): reply for reply in replies}
+    fee_history = by_id[1]["result"]
+
+    # Invalidate by block number: anything cached before this block is stale.
+    number_hex = fee_history.get("oldestBlock")
+    if number_hex is not None:
+        number = int(number_hex, 16)
+        last = _cache_block.get(url)
+        if last is not None and number > last:
+            _cache.pop((url, "fee_history"), None)
+        _cache_block[url] = number
+
+    _cache_put(url, "fee_history", fee_history)
+    return fee_history
+
+async def _get_or_fetch(url: str) -> dict:
+    """
+    Return the fee-history payload for `url`.
+
+    A fresh cache entry is returned directly. Once the block-aligned TTL
+    has lapsed every caller waits for revalidated data — concurrent
+    callers coalesce onto the single in-flight request — so the first
+    call after a new block never sees the previous block's entry.
+    """
+    fee_history = _cache_get(url, "fee_history")
+    if fee_history is not None:
+        return fee_history
+
+    task = _refreshing.get(url)
+    if task is not None:
+        return await task
+
+    task = asyncio.create_task(_fetch_and_cache(url))
+    _refreshing[url] = task
+    try:
+        return await task
+    finally:
+        _refreshing.pop(url, None)
+
+async def fetch_gas_prices(retries: int = 5, delay: int = 1, url: str = PROVIDER_URL) -> Optional[GasSample]:
     """
     Fetch current gas prices in gwei with retry and exponential backoff.
 
+    A single eth_feeHistory call over a persistent keep-alive connection
+    yields the base fee, the median observed priority fee and the block
+    number, with a short TTL cache so sub-block-time polling skips the
+    network entirely. The quoted gas price is base fee + median priority
+    fee, so no separate eth_gasPrice call is needed.
+
     Args:
         retries (int): Number of retries for fetching data.
         delay (int): Initial delay between retries (in seconds).
+        url (str): Provider endpoint to query.
 
     Returns:
-        dict or None: Gas prices in gwei if successful, None otherwise.
+        GasSample or None: Gas prices in gwei if successful, None otherwise.
     """
+    breaker = _breakers.setdefault(url, CircuitBreaker())
+    deadline = time.monotonic() + MAX_TOTAL_BACKOFF
     for attempt in range(retries):
+        if breaker.is_open():
+            # Sustained outage: skip the whole retry/backoff budget and
+            # come back when the open window allows a probe.
+            logger.warning("Circuit open for %s; skipping fetch.", url)
+            return None
         try:
-            gas_price = web3.eth.gas_price
-            pending_block = web3.eth.get_block('pending')
-
-            # Check for 'baseFeePerGas' in the pending block
-            if 'baseFeePerGas' not in pending_block:
-                logging.warning("Pending block lacks 'baseFeePerGas'. Returning only the gas price.")
-                return {"gas_price": web3.from_wei(gas_price, 'gwei')}
-
-            base_fee = pending_block['baseFeePerGas']
-            priority_fee = gas_price - base_fee
-
-            gas_data = {
-                "gas_price": web3.from_wei(gas_price, 'gwei'),
-                "base_fee": web3.from_wei(base_fee, 'gwei'),
-                "priority_fee": web3.from_wei(priority_fee, 'gwei'),
-            }
-
-            logging.info(
-                "Gas Price: %(gas_price).2f gwei | Base Fee: %(base_fee).2f gwei | Priority Fee: %(priority_fee).2f gwei",
-                gas_data
+            fee_history = await _get_or_fetch(url)
+
+            # Within one block both fees are fixed, so reuse the last sample
+            # without re-deriving anything.
+            last = _last_sample.get(url)
+            block_number = _cache_block.get(url)
+            if (last is not None and block_number is not None
+                    and last.block_number == block_number):
+                _backoff_success()
+                breaker.record_success()
+                return last
+
+            # baseFeePerGas holds blockCount + 1 entries; the last one is
+            # the base fee of the next (pending) block.
+            base_fees = fee_history.get("baseFeePerGas")
+            if not base_fees:
+                logger.warning("Fee history lacks 'baseFeePerGas'. No sample this cycle.")
+                _backoff_success()
+                breaker.record_success()
+                return None
+
+            base_fee = int(base_fees[-1], 16)
+            rewards = fee_history.get("reward")
+            priority_fee = int(rewards[-1][0], 16) if rewards else 0
+
+            # All fee arithmetic stays in integer wei; convert each
+            # component to gwei exactly once and derive the total by a
+            # single float add.
+            base_fee_gwei = _wei_to_gwei(base_fee)
+            priority_fee_gwei = _wei_to_gwei(priority_fee)
+
+            # Adjacent blocks often carry identical fees during quiet
+            # periods; reuse the previous sample (restamped with the new
+            # block number) instead of rebuilding and re-logging it.
+            if (last is not None
+                    and last.base_fee == base_fee_gwei
+                    and last.priority_fee == priority_fee_gwei):
+                sample = last._replace(block_number=block_number)
+                _last_sample[url] = sample
+                _backoff_success()
+                breaker.record_success()
+                return sample
+
+            sample = GasSample(
+                base_fee_gwei + priority_fee_gwei,
+                base_fee_gwei,
+                priority_fee_gwei,
+                block_number,
             )
-            return gas_data
 
-        except (requests.exceptions.Timeout, TimeExhausted) as e:
-            logging.warning(f"Connection issue: {e}. Retrying {attempt + 1}/{retries}...")
+            _last_sample[url] = sample
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Gas Price: %.2f gwei | Base Fee: %.2f gwei | Priority Fee: %.2f gwei",
+                    sample.gas_price, sample.base_fee, sample.priority_fee
+                )
+            _backoff_success()
+            breaker.record_success()
+            return sample
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning("Connection issue: %s. Retrying %d/%d...", e, attempt + 1, retries)
+            err_type = type(e)
+            retry_after = None
+            breaker.record_failure()
+            if isinstance(e, aiohttp.ClientResponseError):
+                # 4xx (other than timeout/rate-limit) will not clear on
+                # retry; fail the cycle fast instead of burning backoff.
+                if e.status < 500 and e.status not in (408, 429):
+                    logger.error("Non-retryable HTTP %d from provider; giving up this cycle.", e.status)
+                    return None
+                if e.headers:
+                    retry_after = e.headers.get("Retry-After")
+            # Only tear down the pooled connections when the transport
+            # itself failed; parse/HTTP errors keep the session warm.
+            if isinstance(e, aiohttp.ClientConnectionError):
+                await _reset_session()
         except Exception as e:
-            logging.error(f"Unexpected error: {e}. Retrying {attempt + 1}/{retries}...")
+            logger.error("Unexpected error: %s. Retrying %d/%d...", e, attempt + 1, retries)
+            err_type = type(e)
+            retry_after = None
+            breaker.record_failure()
 
-        time.sleep(delay * 2 ** attempt)  # Exponential backoff
+        if attempt + 1 >= retries:
+            # Last attempt already failed; sleeping again buys nothing.
+            break
+
+        try:
+            retry_wait = float(retry_after) if retry_after else None
+        except ValueError:
+            retry_wait = None
+        if retry_wait is not None:
+            # The provider said exactly when to come back; honor it.
+            _backoff_failure(err_type)
+            await asyncio.sleep(min(retry_wait, MAX_RETRY_DELAY))
+        else:
+            await exponential_backoff(attempt, base=delay * _backoff_failure(err_type), deadline=deadline)
+        if time.monotonic() >= deadline:
+            logger.error("Backoff budget exhausted for this cycle.")
+            break
 
-    logging.error("Failed to fetch gas prices after multiple attempts.")
+    logger.error("Failed to fetch gas prices after multiple attempts.")
     return None
 
-def monitor_gas_prices(interval: int = 10, retries: int = 5, delay: int = 1):
+def _emit_json(sample: GasSample) -> None:
+    """Write one JSON line for `sample` to stdout.
+
+    orjson serializes straight to bytes (no str -> bytes re-encode) and is
+    several times faster than the stdlib encoder; fall back to stdlib json
+    when it is not installed.
+    """
+    out = sys.stdout.buffer
+    fields = sample._asdict()
+    if orjson is not None:
+        out.write(orjson.dumps(fields))
+    else:
+        out.write(json.dumps(fields, ensure_ascii=False).encode())
+    out.write(b"\n")
+    out.flush()
+
+def _adapt_interval(current: float, history: "collections.deque[float]") -> float:
+    """
+    Scale the polling interval by observed gas-price volatility.
+
+    A calm market wastes RPCs at a fixed interval and a volatile one is
+    under-sampled; double the interval below VOLATILITY_LOW, halve it
+    above VOLATILITY_HIGH, and leave it alone in between.
+    """
+    if len(history) < VOLATILITY_WINDOW // 2:
+        return current
+    stdev = statistics.pstdev(history)
+    if stdev < VOLATILITY_LOW:
+        return min(current * 2, MAX_POLL_INTERVAL)
+    if stdev > VOLATILITY_HIGH:
+        return max(current / 2, MIN_POLL_INTERVAL)
+    return current
+
+async def _stoppable_sleep(stop: asyncio.Event, seconds: float) -> bool:
+    """
+    Sleep up to `seconds`, waking immediately if the stop event is set.
+
+    Returns:
+        bool: True if woken by the stop event, False on normal timeout.
+    """
+    try:
+        await asyncio.wait_for(stop.wait(), timeout=seconds)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+async def _close_on_stop(stop: asyncio.Event, ws: aiohttp.ClientWebSocketResponse) -> None:
+    """Close the WebSocket as soon as the stop event is set."""
+    await stop.wait()
+    await ws.close()
+
+async def _monitor_new_heads(stop: asyncio.Event, url: str = PROVIDER_URL) -> None:
+    """
+    Event-driven monitoring over a WebSocket newHeads subscription.
+
+    The provider pushes every new block header (Base headers include
+    'baseFeePerGas'), so there is one message per block instead of
+    polling; eth_gasPrice is only refreshed opportunistically every
+    GAS_PRICE_REFRESH_HEADS heads over the same socket.
+    """
+    session = _get_session()
+    gas_price: Optional[int] = None
+    heads_seen = 0
+
+    # This loop runs once per block; bind the per-message lookups to
+    # locals so each head skips the module/enum attribute walks.
+    loads = _loads
+    wei_to_gwei = _wei_to_gwei
+    text_type = aiohttp.WSMsgType.TEXT
+
+    async with session.ws_connect(url, heartbeat=30) as ws:
+        await ws.send_json({"jsonrpc": "2.0", "id": 1, "method": "eth_subscribe", "params": ["newHeads"]})
+        closer = asyncio.create_task(_close_on_stop(stop, ws))
+        try:
+            async for msg in ws:
+                if msg.type != text_type:
+                    break
+                payload = loads(msg.data)
+
+                # Replies to our own requests (subscription id, gas price)
+                if "params" not in payload:
+                    if payload.get("id") == 2 and isinstance(payload.get("result"), str):
+                        gas_price = int(payload["result"], 16)
+                    continue
+
+                head = payload["params"]["result"]
+                base_fee_hex = head.get("baseFeePerGas")
+                if base_fee_hex is None:
+                    logger.warning("New head lacks 'baseFeePerGas'; skipping.")
+                    continue
+                base_fee = int(base_fee_hex, 16)
+
+                heads_seen += 1
+                # A cached quote below the new base fee predates a fee
+                # increase: refresh it immediately instead of waiting for
+                # the Nth head, and floor it at the base fee meanwhile so
+                # the derived priority fee cannot go negative.
+                quote_stale = gas_price is not None and gas_price < base_fee
+                if gas_price is None or quote_stale or heads_seen % GAS_PRICE_REFRESH_HEADS == 1:
+                    await ws.send_json({"jsonrpc": "2.0", "id": 2, "method": "eth_gasPrice", "params": []})
+                if quote_stale:
+                    gas_price = base_fee
+
+                block_number = int(head["number"], 16)
+                sample = GasSample(
+                    wei_to_gwei(gas_price) if gas_price is not None else None,
+                    wei_to_gwei(base_fee),
+                    wei_to_gwei(gas_price - base_fee) if gas_price is not None else None,
+                    block_number,
+                )
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("New head #%d: %s", block_number, sample)
+                if OUTPUT_JSON:
+                    _emit_json(sample)
+        finally:
+            closer.cancel()
+
+async def monitor_gas_prices(interval: int = 10, retries: int = 5, delay: int = 1,
+                             url: str = PROVIDER_URL, stop: Optional[asyncio.Event] = None):
     """
-    Continuously fetch and log gas prices at a specified interval.
+    Continuously fetch and log gas prices for one provider endpoint.
+
+    With a ws:// or wss:// provider URL the interval is ignored and
+    blocks are consumed as the provider pushes them via a newHeads
+    subscription. When no stop event is supplied (standalone use), one is
+    created and bound to SIGINT/SIGTERM.
 
     Args:
         interval (int): Time interval (in seconds) between gas price fetches.
         retries (int): Number of retries for fetching data on failure.
         delay (int): Initial delay between retries (exponential backoff applied).
+        url (str): Provider endpoint to monitor.
+        stop (asyncio.Event, optional): Externally owned shutdown signal.
     """
-    logging.info("Starting gas price monitoring...")
+    if stop is None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+
+    logger.info("Starting gas price monitoring for %s...", url)
 
     try:
-        while True:
-            gas_prices = fetch_gas_prices(retries, delay)
-            if gas_prices:
-                logging.info("Gas prices fetched successfully: %s", gas_prices)
-            else:
-                logging.warning("Failed to fetch gas prices in this cycle.")
-            time.sleep(interval)
-    except KeyboardInterrupt:
-        logging.info("Monitoring interrupted by the user.")
+        if url.startswith(("ws://", "wss://")):
+            # Providers drop idle subscriptions; reconnect with jittered
+            # backoff instead of silently ending the monitor.
+            attempt = 0
+            while not stop.is_set():
+                connected_at = time.monotonic()
+                try:
+                    await _monitor_new_heads(stop, url)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    logger.warning("WebSocket connection lost: %s. Reconnecting...", e)
+                if stop.is_set():
+                    break
+                if time.monotonic() - connected_at >= WS_STABLE_SECONDS:
+                    # The subscription held for a while, so this drop is a
+                    # fresh incident, not part of a failure streak.
+                    attempt = 0
+                await exponential_backoff(attempt, base=delay)
+                attempt += 1
+        else:
+            history: collections.deque[float] = collections.deque(maxlen=VOLATILITY_WINDOW)
+            current_interval = float(interval)
+            # Schedule against absolute monotonic deadlines so fetch
+            # latency never drifts the cadence: each tick lands at
+            # previous deadline + interval, not at fetch-end + interval.
+            next_tick = time.monotonic()
+            while not stop.is_set():
+                next_tick += current_interval
+                # Start the interval wait before the fetch so the network
+                # round-trip overlaps the sleep: one cycle costs
+                # max(interval, fetch latency) instead of their sum.
+                sleeper = asyncio.create_task(
+                    _stoppable_sleep(stop, max(0.0, next_tick - time.monotonic()))
+                )
+                try:
+                    gas_prices = await fetch_gas_prices(retries, delay, url)
+                except BaseException:
+                    sleeper.cancel()
+                    raise
+                if gas_prices:
+                    logger.info("Gas prices fetched successfully: %s", gas_prices)
+                    if OUTPUT_JSON:
+                        _emit_json(gas_prices)
+                    if gas_prices.gas_price is not None:
+                        history.append(gas_prices.gas_price)
+                        current_interval = _adapt_interval(current_interval, history)
+                else:
+                    logger.warning("Failed to fetch gas prices in this cycle.")
+                if await sleeper:
+                    break
+                # After a long stall (e.g. a retry storm outlasting the
+                # interval) resynchronize instead of firing a burst of
+                # zero-length sleeps to catch up on missed ticks.
+                now = time.monotonic()
+                if now - next_tick > current_interval:
+                    next_tick = now
     except Exception as e:
-        logging.error(f"Unexpected error during monitoring: {e}")
+        logger.error("Unexpected error during monitoring: %s", e)
+    finally:
+        logger.info("Gas price monitoring stopped for %s.", url)
+
+async def main(interval: int = 10) -> None:
+    """
+    Schedule one monitor task per configured provider URL and run until
+    a SIGINT/SIGTERM sets the shared stop event.
+    """
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    tasks = [
+        asyncio.create_task(monitor_gas_prices(interval=interval, url=url, stop=stop))
+        for url in PROVIDER_URLS
+    ]
+    try:
+        await asyncio.gather(*tasks, return_exceptions=True)
     finally:
-        logging.info("Gas price monitoring stopped.")
+        if _session is not None and not _session.closed:
+            await _session.close()
+
+def _setup_logging() -> None:
+    """
+    Configure logging to stdout and a rotating file via a queue.
+
+    Records are enqueued by a QueueHandler (a ~100ns put) and formatted /
+    written by a background QueueListener thread, so the fetch loop never
+    blocks on disk writes or file rollover. Idempotent: calling it again
+    (e.g. from an importer that also configures logging) will not attach
+    duplicate handlers, which would double every log write.
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return
+
+    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+    # gmtime skips the per-record timezone lookup localtime performs and
+    # keeps timestamps deterministic across host TZ changes.
+    formatter.converter = time.gmtime
+    stream_handler = logging.StreamHandler(sys.stdout)
+    # delay=True defers opening the log file until the first record, so a
+    # process that fails during startup never touches the disk.
+    file_handler = RotatingFileHandler(LOG_FILE, maxBytes=10_000_000, backupCount=3, delay=True)
+    stream_handler.setFormatter(formatter)
+    file_handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    root.setLevel(logging.INFO)
+    root.addHandler(QueueHandler(log_queue))
+
+    listener = QueueListener(log_queue, stream_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
 
 if __name__ == "__main__":
-    # Set up logging to stdout and file with detailed format
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler("gas_price_monitor.log"),
-        ],
-    )
+    _setup_logging()
 
     # Start the monitoring script
-    monitor_gas_prices(interval=10)
+    asyncio.run(main(interval=10))